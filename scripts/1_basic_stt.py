@@ -14,25 +14,12 @@ The script prints the transcript, overall confidence and per‑word details.
 
 from __future__ import annotations
 
-import os
 import sys
 from typing import Optional
 
 from google.cloud import speech
 
-
-def guess_encoding(file_path: str) -> speech.RecognitionConfig.AudioEncoding:
-    """Infer the audio encoding from the file extension.
-
-    If the extension is unrecognised, returns ENCODING_UNSPECIFIED, which
-    allows the API to attempt to determine the encoding automatically.
-    """
-    ext = os.path.splitext(file_path)[1].lower()
-    if ext == ".mp3":
-        return speech.RecognitionConfig.AudioEncoding.MP3
-    if ext in {".wav", ".pcm", ".raw"}:
-        return speech.RecognitionConfig.AudioEncoding.LINEAR16
-    return speech.RecognitionConfig.AudioEncoding.ENCODING_UNSPECIFIED
+from _stt_cache import get_response, guess_encoding
 
 
 def transcribe_audio(audio_path: str) -> Optional[speech.RecognizeResponse]:
@@ -51,25 +38,12 @@ def transcribe_audio(audio_path: str) -> Optional[speech.RecognizeResponse]:
         print(f"Error reading file: {exc}", file=sys.stderr)
         return None
 
-    # Initialize API client
-    client = speech.SpeechClient()
-
-    # Build recognition request
-    audio = speech.RecognitionAudio(content=content)
+    # Synchronous recognition for short clips, long-running via Cloud
+    # Storage beyond ~1 minute; later pipeline steps reuse the cached response
     encoding = guess_encoding(audio_path)
-    config = speech.RecognitionConfig(
-        encoding=encoding,
-        language_code="en-US",
-        enable_automatic_punctuation=True,
-        enable_word_confidence=True,
-        enable_word_time_offsets=True,
-        model="default",
-    )
-
-    # Perform synchronous recognition (suitable for audio <1 minute)
     print(f"Transcribing {audio_path} using encoding {encoding.name}...")
     try:
-        response = client.recognize(config=config, audio=audio)
+        response = get_response(audio_path, content)
     except Exception as exc:  # pylint: disable:broad-except
         print(f"API error: {exc}", file=sys.stderr)
         return None
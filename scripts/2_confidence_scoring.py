@@ -1,73 +1,36 @@
 # scripts/2_confidence_scoring.py
 
-from google.cloud import speech
-import librosa
-import numpy as np
 import sys
 
-def calculate_snr(audio_path):
-    """Calculate Signal-to-Noise Ratio"""
-    # Load audio
-    y, sr = librosa.load(audio_path, sr=16000)
-    
-    # Estimate signal power (mean of squared samples)
-    signal_power = np.mean(y ** 2)
-    
-    # Estimate noise power (variance)
-    noise_power = np.var(y)
-    
-    # Calculate SNR in dB
-    if noise_power > 0:
-        snr_db = 10 * np.log10(signal_power / noise_power)
-    else:
-        snr_db = float('inf')  # No noise detected
-    
-    return snr_db
-
-
-def calculate_word_perplexity(words):
-    """
-    Calculate perplexity based on word-level confidence.
-    Lower confidence = higher perplexity = more uncertain
-    """
-    confidences = [word.confidence for word in words]
-    avg_confidence = np.mean(confidences)
-    
-    # Convert to perplexity-like score (inverse of confidence)
-    perplexity = 1.0 / avg_confidence if avg_confidence > 0 else float('inf')
-    
-    return perplexity
+from _stt_cache import best_alternative, get_response, word_confidences
+from utils_audio import calculate_snr, read_audio_bytes
 
 
 def multi_factor_confidence(audio_path):
     """Analyze confidence using multiple factors"""
     
+    # The file is read once; STT and the SNR decode share the bytes
+    content = read_audio_bytes(audio_path)
+
     # Factor 1: Google's API confidence
-    client = speech.SpeechClient()
-    
-    with open(audio_path, 'rb') as audio_file:
-        content = audio_file.read()
-    
-    audio = speech.RecognitionAudio(content=content)
-    config = speech.RecognitionConfig(
-        encoding=speech.RecognitionConfig.AudioEncoding.MP3,
-        sample_rate_hertz=16000,
-        language_code="en-US",
-        enable_word_confidence=True,
-    )
-    
-    response = client.recognize(config=config, audio=audio)
-    
-    # Extract API confidence and words
-    api_confidence = response.results[0].alternatives[0].confidence
-    words = response.results[0].alternatives[0].words
-    transcript = response.results[0].alternatives[0].transcript
+    response = get_response(audio_path, content)
+    
+    # Extract API confidence (mean word confidence) and words
+    alternative = best_alternative(response)
+    words = alternative.words
+    transcript = alternative.transcript
+    confidences = word_confidences(words)
+    # No recognized words scores as zero confidence (LOW) rather than NaN
+    api_confidence = float(confidences.mean()) if confidences.size else 0.0
+    if not confidences.size:
+        print("No speech recognized.")
     
     # Factor 2: Audio Quality (SNR)
-    snr = calculate_snr(audio_path)
+    snr = calculate_snr(content)
     
     # Factor 3: Language Perplexity
-    perplexity = calculate_word_perplexity(words)
+    # Lower confidence = higher perplexity = more uncertain
+    perplexity = 1.0 / api_confidence if api_confidence > 0 else float('inf')
     
     # Combined Score (weighted average)
     # API confidence: 50%, SNR: 30%, Perplexity: 20%
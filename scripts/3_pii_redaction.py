@@ -1,79 +1,16 @@
 # scripts/3_pii_redaction.py
 
-from google.cloud import speech
-import re
-import spacy
 import sys
 
-# Load spaCy model for Named Entity Recognition
-nlp = spacy.load("en_core_web_sm")
-
-def redact_pii_regex(text):
-    """Redact PII using regex patterns"""
-    
-    patterns = {
-        'CREDIT_CARD': r'\b\d{4}[\s-]?\d{4}[\s-]?\d{4}[\s-]?\d{4}\b',
-        'SSN': r'\b\d{3}[-\s]?\d{2}[-\s]?\d{4}\b',
-        'PHONE': r'\b\d{3}[-.\s]?\d{3}[-.\s]?\d{4}\b',
-        'EMAIL': r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b',
-    }
-    
-    redacted = text
-    redactions = []
-    
-    for pii_type, pattern in patterns.items():
-        matches = re.finditer(pattern, text)
-        for match in matches:
-            original = match.group()
-            redacted = redacted.replace(original, f'[REDACTED_{pii_type}]')
-            redactions.append({
-                'type': pii_type,
-                'original': original,
-                'position': match.span()
-            })
-    
-    return redacted, redactions
-
-def redact_pii_ner(text):
-    """Redact PII using Named Entity Recognition"""
-    
-    doc = nlp(text)
-    redacted = text
-    redactions = []
-    
-    # Sort entities by position (reverse) to maintain indices
-    entities = sorted(doc.ents, key=lambda e: e.start_char, reverse=True)
-    
-    for ent in entities:
-        # Redact PERSON names and DATE (potential DOB)
-        if ent.label_ in ['PERSON', 'DATE']:
-            redacted = redacted[:ent.start_char] + f'[REDACTED_{ent.label_}]' + redacted[ent.end_char:]
-            redactions.append({
-                'type': ent.label_,
-                'original': ent.text,
-                'position': (ent.start_char, ent.end_char)
-            })
-    
-    return redacted, redactions
+from _stt_cache import best_alternative, get_response
+from utils_pii import redact_pii_ner, redact_pii_regex
 
 def transcribe_and_redact(audio_path):
     """Transcribe audio and redact PII"""
     
     # Step 1: Transcribe
-    client = speech.SpeechClient()
-    
-    with open(audio_path, 'rb') as audio_file:
-        content = audio_file.read()
-    
-    audio = speech.RecognitionAudio(content=content)
-    config = speech.RecognitionConfig(
-        encoding=speech.RecognitionConfig.AudioEncoding.MP3,
-        sample_rate_hertz=16000,
-        language_code="en-US",
-    )
-    
-    response = client.recognize(config=config, audio=audio)
-    transcript = response.results[0].alternatives[0].transcript
+    response = get_response(audio_path)
+    transcript = best_alternative(response).transcript
     
     print(f"{'='*60}")
     print(f"ORIGINAL TRANSCRIPT:")
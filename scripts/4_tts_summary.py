@@ -1,51 +1,8 @@
-from google.cloud import speech, texttospeech
 import sys
 
-
-def summarize_text(text, max_sentences=3):
-    """
-    Simple extractive summarization: pick first N sentences.
-    For homework, use better methods (TF-IDF, TextRank, or GPT)
-    """
-    sentences = text.split('. ')
-    summary = '. '.join(sentences[:max_sentences])
-
-    if not summary.endswith('.'):
-        summary += '.'
-
-    return summary
-
-
-def text_to_speech(text, output_file="output_summary.mp3", voice_name="en-US-Neural2-A"):
-    """Generate audio from text using Google Cloud TTS"""
-
-    client = texttospeech.TextToSpeechClient()
-
-    synthesis_input = texttospeech.SynthesisInput(text=text)
-
-    voice = texttospeech.VoiceSelectionParams(
-        language_code="en-US",
-        name=voice_name
-    )
-
-    audio_config = texttospeech.AudioConfig(
-        audio_encoding=texttospeech.AudioEncoding.MP3,
-        speaking_rate=1.0,
-        pitch=0.0,
-        volume_gain_db=0.0,
-    )
-
-    response = client.synthesize_speech(
-        input=synthesis_input,
-        voice=voice,
-        audio_config=audio_config
-    )
-
-    with open(output_file, 'wb') as out:
-        out.write(response.audio_content)
-
-    print(f"Audio summary saved: {output_file}")
-    return output_file
+from _stt_cache import best_alternative, get_response
+from _tts import text_to_speech
+from utils_summary import summarize_text
 
 
 def transcribe_summarize_tts(audio_path):
@@ -53,20 +10,8 @@ def transcribe_summarize_tts(audio_path):
 
     print("Step 1: Transcribing audio...")
 
-    speech_client = speech.SpeechClient()
-
-    with open(audio_path, 'rb') as audio_file:
-        content = audio_file.read()
-
-    audio = speech.RecognitionAudio(content=content)
-    config = speech.RecognitionConfig(
-        encoding=speech.RecognitionConfig.AudioEncoding.MP3,
-        sample_rate_hertz=16000,
-        language_code="en-US",
-    )
-
-    response = speech_client.recognize(config=config, audio=audio)
-    transcript = response.results[0].alternatives[0].transcript
+    response = get_response(audio_path)
+    transcript = best_alternative(response).transcript
 
     print(f"Original Transcript ({len(transcript)} chars):")
     print(transcript)
@@ -0,0 +1,257 @@
+"""Shared, cached Speech-to-Text recognition.
+
+Every stage script transcribes the same input file, so running the
+pipeline step by step used to pay for the same ``recognize()`` call four
+or five times.  Responses are keyed by the SHA-256 of the audio bytes,
+the request encoding and sample rate, memoised in-process (bounded LRU)
+and persisted as serialized
+protobufs under ``~/.cache/ai-audio-pipeline`` so later scripts reuse
+them.  Cached responses hold the unredacted transcript, so the directory
+and its files are readable by the owner only.
+
+Synchronous ``recognize()`` only accepts about a minute of inline audio.
+Longer or larger files are uploaded to the Cloud Storage bucket named by
+``AIAP_GCS_BUCKET`` and transcribed with ``long_running_recognize()``.
+"""
+
+from __future__ import annotations
+
+import functools
+import hashlib
+import os
+from collections import OrderedDict
+from typing import Optional
+
+import numpy as np
+from google.cloud import speech
+from google.protobuf.message import DecodeError
+
+from utils_audio import audio_duration, audio_sample_rate, read_audio_bytes
+
+CACHE_DIR = os.path.join(
+    os.environ.get("XDG_CACHE_HOME", os.path.expanduser("~/.cache")),
+    "ai-audio-pipeline",
+)
+
+# Limits for inline synchronous recognition (API caps are 10 MB / 60 s)
+SYNC_MAX_BYTES = 8 * 1024 * 1024
+SYNC_MAX_SECONDS = 55.0
+# Bitrate assumed when a file's duration cannot be read; deliberately low
+# for speech MP3s so the estimate errs towards long-running recognition
+ESTIMATE_BITS_PER_SECOND = 64_000
+UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+LONG_RUNNING_TIMEOUT = 900
+
+# Most recently used responses kept in memory by a long-running process
+MEMORY_CACHE_SIZE = 32
+
+# Encodings whose sample rate the API reads from the file header; every
+# other encoding (MP3 in particular) must state it in the request
+_HEADER_RATE_ENCODINGS = frozenset({
+    speech.RecognitionConfig.AudioEncoding.LINEAR16,
+    speech.RecognitionConfig.AudioEncoding.FLAC,
+    speech.RecognitionConfig.AudioEncoding.ENCODING_UNSPECIFIED,
+})
+# Used when a file's rate cannot be read (the rate the scripts used to hardcode)
+DEFAULT_SAMPLE_RATE = 16000
+
+# Shared by every request; only the encoding and sample rate vary per file
+_BASE_CFG_KW = dict(
+    language_code="en-US",
+    enable_automatic_punctuation=True,
+    enable_word_confidence=True,
+    enable_word_time_offsets=True,
+    model="default",
+)
+
+_responses: OrderedDict[tuple[str, int, int], speech.RecognizeResponse] = OrderedDict()
+
+
+@functools.lru_cache(maxsize=1)
+def _speech_client() -> speech.SpeechClient:
+    # One client per process reuses its gRPC channel and credentials
+    return speech.SpeechClient()
+
+
+@functools.lru_cache(maxsize=1)
+def _storage_client():
+    from google.cloud import storage
+
+    return storage.Client()
+
+
+@functools.lru_cache(maxsize=None)
+def _config_for(
+    encoding: speech.RecognitionConfig.AudioEncoding,
+    sample_rate: Optional[int],
+) -> speech.RecognitionConfig:
+    if sample_rate is None:
+        return speech.RecognitionConfig(encoding=encoding, **_BASE_CFG_KW)
+    return speech.RecognitionConfig(encoding=encoding, sample_rate_hertz=sample_rate, **_BASE_CFG_KW)
+
+
+def _request_sample_rate(
+    audio_path: str,
+    encoding: speech.RecognitionConfig.AudioEncoding,
+) -> Optional[int]:
+    """Return the sample rate to send, or None where the API reads the header."""
+    if encoding in _HEADER_RATE_ENCODINGS:
+        return None
+    return audio_sample_rate(audio_path) or DEFAULT_SAMPLE_RATE
+
+
+def guess_encoding(file_path: str) -> speech.RecognitionConfig.AudioEncoding:
+    """Infer the audio encoding from the file extension.
+
+    If the extension is unrecognised, returns ENCODING_UNSPECIFIED, which
+    allows the API to attempt to determine the encoding automatically.
+    """
+    ext = os.path.splitext(file_path)[1].lower()
+    if ext == ".mp3":
+        return speech.RecognitionConfig.AudioEncoding.MP3
+    if ext in {".wav", ".pcm", ".raw"}:
+        return speech.RecognitionConfig.AudioEncoding.LINEAR16
+    return speech.RecognitionConfig.AudioEncoding.ENCODING_UNSPECIFIED
+
+
+def _cache_path(
+    digest: str,
+    encoding: speech.RecognitionConfig.AudioEncoding,
+    sample_rate: Optional[int],
+) -> str:
+    return os.path.join(CACHE_DIR, f"{digest}-{encoding.name}-{sample_rate or 'auto'}.pb")
+
+
+def _read_cached(path: str) -> Optional[speech.RecognizeResponse]:
+    try:
+        with open(path, "rb") as f:
+            return speech.RecognizeResponse.deserialize(f.read())
+    except (OSError, DecodeError):
+        # Missing or corrupt entry; fall through to a fresh request
+        return None
+
+
+def _write_cached(path: str, response: speech.RecognizeResponse) -> None:
+    tmp_path = f"{path}.tmp"
+    try:
+        os.makedirs(CACHE_DIR, mode=0o700, exist_ok=True)
+        # Also tighten a directory left behind with default permissions
+        os.chmod(CACHE_DIR, 0o700)
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "wb") as f:
+            f.write(speech.RecognizeResponse.serialize(response))
+        os.replace(tmp_path, path)
+    except OSError:
+        # Caching is best effort; a read-only home directory is not an error
+        pass
+
+
+def _needs_long_running(audio_path: str, content: bytes) -> bool:
+    if len(content) > SYNC_MAX_BYTES:
+        return True
+    duration = audio_duration(audio_path)
+    if duration is None:
+        duration = len(content) * 8 / ESTIMATE_BITS_PER_SECOND
+    return duration > SYNC_MAX_SECONDS
+
+
+def _upload_to_gcs(audio_path: str, digest: str) -> str:
+    """Upload the file to ``AIAP_GCS_BUCKET`` and return its gs:// URI."""
+    bucket_name = os.environ.get("AIAP_GCS_BUCKET")
+    if not bucket_name:
+        raise RuntimeError(
+            f"{audio_path} is too long for synchronous recognition; "
+            "set AIAP_GCS_BUCKET to a Cloud Storage bucket for long audio"
+        )
+
+    ext = os.path.splitext(audio_path)[1].lower()
+    blob = _storage_client().bucket(bucket_name).blob(f"ai-audio-pipeline/{digest}{ext}")
+    # Objects are content-addressed, so an existing blob is already this audio
+    if not blob.exists():
+        blob.chunk_size = UPLOAD_CHUNK_SIZE
+        blob.upload_from_filename(audio_path)
+    return f"gs://{bucket_name}/{blob.name}"
+
+
+def _recognize(
+    audio_path: str,
+    content: bytes,
+    digest: str,
+    encoding: speech.RecognitionConfig.AudioEncoding,
+    sample_rate: Optional[int],
+) -> speech.RecognizeResponse:
+    client = _speech_client()
+    config = _config_for(encoding, sample_rate)
+
+    if not _needs_long_running(audio_path, content):
+        audio = speech.RecognitionAudio(content=content)
+        return client.recognize(config=config, audio=audio)
+
+    audio = speech.RecognitionAudio(uri=_upload_to_gcs(audio_path, digest))
+    operation = client.long_running_recognize(config=config, audio=audio)
+    result = operation.result(timeout=LONG_RUNNING_TIMEOUT)
+    # Same results shape as the synchronous call, so callers and the cache agree
+    return speech.RecognizeResponse(results=result.results)
+
+
+def best_alternative(response: speech.RecognizeResponse) -> speech.SpeechRecognitionAlternative:
+    """Merge the top alternative of every result into one alternative.
+
+    Long-running recognition returns one result per segment of audio, so
+    the transcript is the segments' transcripts joined in order and the
+    words are their word lists concatenated.
+    """
+    merged = speech.SpeechRecognitionAlternative()
+    merged_words = speech.SpeechRecognitionAlternative.pb(merged).words
+    transcripts = []
+    for result in response.results:
+        if not result.alternatives:
+            continue
+        top = result.alternatives[0]
+        transcripts.append(top.transcript.strip())
+        merged_words.extend(speech.SpeechRecognitionAlternative.pb(top).words)
+    merged.transcript = " ".join(t for t in transcripts if t)
+    return merged
+
+
+def word_confidences(words) -> np.ndarray:
+    """Return the confidences of a ``words`` repeated field as float32.
+
+    Iterates the underlying protobuf container (upb/C++ backed) rather
+    than the proto-plus wrapper, which builds a Python message object per
+    element.
+    """
+    container = getattr(words, "pb", words)
+    return np.fromiter((w.confidence for w in container), dtype=np.float32, count=len(container))
+
+
+def get_response(audio_path: str, content: Optional[bytes] = None) -> speech.RecognizeResponse:
+    """Return the recognition response for ``audio_path``.
+
+    ``content`` may be passed when the caller has already read the file.
+    The API is only called when neither the in-process nor the on-disk
+    cache holds a response for these exact bytes.
+    """
+    if content is None:
+        content = read_audio_bytes(audio_path)
+
+    digest = hashlib.sha256(content).hexdigest()
+    encoding = guess_encoding(audio_path)
+    sample_rate = _request_sample_rate(audio_path, encoding)
+    key = (digest, int(encoding), sample_rate or 0)
+
+    response = _responses.get(key)
+    if response is not None:
+        _responses.move_to_end(key)
+        return response
+
+    path = _cache_path(digest, encoding, sample_rate)
+    response = _read_cached(path)
+    if response is None:
+        response = _recognize(audio_path, content, digest, encoding, sample_rate)
+        _write_cached(path, response)
+
+    _responses[key] = response
+    if len(_responses) > MEMORY_CACHE_SIZE:
+        _responses.popitem(last=False)
+    return response
@@ -0,0 +1,51 @@
+"""Shared Text-to-Speech synthesis.
+
+Both the TTS stage script and the full pipeline synthesize their summary
+through here, so a process sets up one client and its gRPC channel
+however many times it calls ``text_to_speech()``.
+"""
+
+from __future__ import annotations
+
+import functools
+
+from google.cloud import texttospeech
+
+DEFAULT_VOICE = "en-US-Neural2-A"
+
+AUDIO_CONFIG = texttospeech.AudioConfig(
+    audio_encoding=texttospeech.AudioEncoding.MP3,
+    speaking_rate=1.0,
+    pitch=0.0,
+    volume_gain_db=0.0,
+)
+
+
+@functools.lru_cache(maxsize=1)
+def _tts_client() -> texttospeech.TextToSpeechClient:
+    # One client per process reuses its gRPC channel and credentials
+    return texttospeech.TextToSpeechClient()
+
+
+@functools.lru_cache(maxsize=8)
+def _voice_params(voice_name: str) -> texttospeech.VoiceSelectionParams:
+    return texttospeech.VoiceSelectionParams(language_code="en-US", name=voice_name)
+
+
+def text_to_speech(
+    text: str,
+    output_file: str = "output_summary.mp3",
+    voice_name: str = DEFAULT_VOICE,
+) -> str:
+    """Synthesize ``text`` as MP3 into ``output_file`` and return its path."""
+    response = _tts_client().synthesize_speech(
+        input=texttospeech.SynthesisInput(text=text),
+        voice=_voice_params(voice_name),
+        audio_config=AUDIO_CONFIG,
+    )
+
+    with open(output_file, "wb") as out:
+        out.write(response.audio_content)
+
+    print(f"Audio summary saved: {output_file}")
+    return output_file
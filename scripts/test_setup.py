@@ -8,14 +8,18 @@ Run this script before starting your homework to catch setup issues early.
 """
 
 import importlib
+import shutil
 import sys
 
 REQUIRED_PACKAGES = [
     "google.cloud.speech",
     "google.cloud.texttospeech",
-    "librosa",
-    "pydub",
+    "google.cloud.storage",
+    "soundfile",
     "numpy",
+    "scipy",
+    "orjson",
+    "sklearn",
     "spacy",
 ]
 
@@ -34,6 +38,26 @@ def check_packages():
     else:
         print("✅ All required packages are installed.")
 
+def check_protobuf_backend():
+    # The pure-Python backend makes iterating large word lists slow
+    try:
+        from google.protobuf.internal import api_implementation
+    except ImportError:
+        return
+    backend = api_implementation.Type()
+    if backend == "python":
+        print("⚠️  protobuf is using its pure-Python backend; upgrade protobuf "
+              "or unset PROTOCOL_BUFFERS_PYTHON_IMPLEMENTATION for the upb backend.")
+    else:
+        print(f"✅ protobuf backend: {backend}")
+
+def check_ffmpeg():
+    # Decodes audio formats libsndfile cannot read (e.g. MP3 on older builds)
+    if shutil.which("ffmpeg"):
+        print("✅ ffmpeg found.")
+    else:
+        print("❌ ffmpeg not found on PATH; MP3 decoding may fail.")
+
 def check_google_credentials():
     try:
         from google.cloud import speech, texttospeech
@@ -49,6 +73,8 @@ def check_google_credentials():
 def main():
     print("Running setup tests...")
     check_packages()
+    check_ffmpeg()
+    check_protobuf_backend()
     check_google_credentials()
     print("Setup test complete.")
 
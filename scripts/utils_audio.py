@@ -0,0 +1,163 @@
+"""Audio helpers shared by the pipeline scripts.
+
+Decoding goes through soundfile (libsndfile) rather than librosa: the SNR
+estimate only needs the raw samples, so librosa's resampling and its
+numba/llvmlite import chain are pure overhead here.  Formats libsndfile
+cannot open (older builds lack MP3) are decoded by piping them through
+the ffmpeg CLI straight into a sample buffer, skipping the Python-level
+audioread/pydub decode shims.
+
+Samples stay as native 16-bit PCM: the SNR reduction is memory-bound, and
+int16 moves half the bytes of float32 with no int-to-float pass.
+
+Decoders accept either a path or the file's bytes, so a caller that has
+already read the audio for the Speech API can decode that same buffer
+instead of reading the file a second time.
+"""
+
+from __future__ import annotations
+
+import io
+import subprocess
+from typing import Optional, Union
+
+import numpy as np
+import soundfile as sf
+
+AudioSource = Union[str, bytes]
+
+# Rate ffmpeg resamples to when it does the decoding (the STT rate)
+FFMPEG_SAMPLE_RATE = 16000
+
+# Samples per int64 block in the SNR sum of squares; keeps the widened
+# temporary cache-sized instead of a full int64 copy of the signal
+SNR_CHUNK_SIZE = 1 << 16
+
+# Subtypes libsndfile converts to int16 with proper scaling; anything else
+# (FLOAT/DOUBLE in particular, which it would truncate to zeros) is read
+# as float32 and scaled here
+_INT_READ_SUBTYPES = ("PCM_", "ULAW", "ALAW")
+
+
+def read_audio_bytes(audio_path: str) -> bytes:
+    """Read the whole audio file once, for both the Speech API and decoding."""
+    with open(audio_path, "rb") as audio_file:
+        return audio_file.read()
+
+
+def _open_source(audio: AudioSource):
+    # BytesIO shares the bytes object's buffer rather than copying it
+    return io.BytesIO(audio) if isinstance(audio, bytes) else audio
+
+
+def _decode_with_ffmpeg(audio: AudioSource, sr: int = FFMPEG_SAMPLE_RATE) -> tuple[np.ndarray, int]:
+    """Decode to mono int16 at ``sr`` with ffmpeg, reading stdout directly."""
+    if isinstance(audio, bytes):
+        source, stdin_data = "pipe:0", audio
+    else:
+        source, stdin_data = audio, None
+    out = subprocess.run(
+        ["ffmpeg", "-v", "quiet", "-i", source, "-f", "s16le", "-ac", "1", "-ar", str(sr), "pipe:1"],
+        input=stdin_data,
+        stdout=subprocess.PIPE,
+        check=True,
+    ).stdout
+    return np.frombuffer(out, dtype=np.int16), sr
+
+
+def load_pcm16(audio: AudioSource) -> tuple[np.ndarray, int]:
+    """Decode an audio file or its bytes to mono 16-bit PCM samples.
+
+    Returns the samples and their sample rate.
+    """
+    try:
+        with sf.SoundFile(_open_source(audio)) as f:
+            sr = f.samplerate
+            if f.subtype.startswith(_INT_READ_SUBTYPES):
+                y = f.read(dtype="int16", always_2d=False)
+            else:
+                y = f.read(dtype="float32", always_2d=False)
+                y = np.clip(np.rint(y * 32768.0), -32768, 32767).astype(np.int16)
+    except RuntimeError:
+        # libsndfile raises LibsndfileError (a RuntimeError) for unsupported formats
+        return _decode_with_ffmpeg(audio)
+
+    if y.ndim > 1:
+        # Round to nearest; floor division would bias every sample by -0.5
+        y = np.rint(y.sum(axis=1, dtype=np.int32) / y.shape[1]).astype(np.int16)
+    return y, sr
+
+
+def _ffprobe(audio_path: str, entry: str, *select: str) -> Optional[str]:
+    """Return one ffprobe field for ``audio_path``, or None if unavailable."""
+    try:
+        out = subprocess.run(
+            ["ffprobe", "-v", "error", *select, "-show_entries", entry,
+             "-of", "default=noprint_wrappers=1:nokey=1", audio_path],
+            stdout=subprocess.PIPE,
+            check=True,
+        ).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.decode().strip() or None
+
+
+def audio_sample_rate(audio_path: str) -> Optional[int]:
+    """Return the sample rate in Hz, or None if it cannot be determined.
+
+    Same lookup order as ``audio_duration``: libsndfile header, then ffprobe.
+    """
+    try:
+        return sf.info(audio_path).samplerate
+    except RuntimeError:
+        pass
+
+    rate = _ffprobe(audio_path, "stream=sample_rate", "-select_streams", "a:0")
+    try:
+        return int(rate) if rate else None
+    except ValueError:
+        return None
+
+
+def audio_duration(audio_path: str) -> Optional[float]:
+    """Return the duration in seconds, or None if it cannot be determined.
+
+    Reads the libsndfile header when possible and otherwise asks ffprobe,
+    which ships with the ffmpeg used for decoding.
+    """
+    try:
+        return sf.info(audio_path).duration
+    except RuntimeError:
+        pass
+
+    duration = _ffprobe(audio_path, "format=duration")
+    try:
+        return float(duration) if duration else None
+    except ValueError:
+        return None
+
+
+def calculate_snr(audio: AudioSource) -> float:
+    """Calculate Signal-to-Noise Ratio in dB.
+
+    Signal power is E[x^2] and noise power is the variance
+    E[x^2] - E[x]^2.  Both are accumulated as exact integers over the
+    int16 samples, so the ratio needs no float rescaling:
+    SNR = n*sum(x^2) / (n*sum(x^2) - sum(x)^2).
+    """
+    y, _ = load_pcm16(audio)
+    n = y.size
+
+    total = int(y.sum(dtype=np.int64))
+    sum_sq = 0
+    for start in range(0, n, SNR_CHUNK_SIZE):
+        # int16 products overflow int32 accumulators, so widen per block
+        block = y[start:start + SNR_CHUNK_SIZE].astype(np.int64)
+        sum_sq += int(np.dot(block, block))
+
+    signal_power = n * sum_sq
+    noise_power = signal_power - total * total
+
+    if noise_power > 0:
+        return 10 * np.log10(signal_power / noise_power)
+    return float("inf")  # No noise detected
@@ -0,0 +1,163 @@
+"""PII redaction helpers shared by the pipeline scripts.
+
+The digit-based patterns are alternatives of one compiled expression
+with a named group per PII type, so a transcript is scanned once for all
+of them.  Emails are prefiltered on their one mandatory literal, '@':
+only the whitespace-delimited tokens containing it are handed to the
+email regex.  The two searches are merged as if they were one
+alternation, and both regex and NER redaction build their output in a
+single forward pass over the matches.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import sys
+
+import spacy
+
+# Components NER does not depend on; excluding them skips loading their
+# weights as well as running them, leaving nlp.pipe_names == ['tok2vec', 'ner']
+# (['transformer', 'ner'] for the GPU model)
+UNUSED_PIPES = ["tagger", "parser", "attribute_ruler", "lemmatizer"]
+
+
+def _load_ner_model():
+    """Load the spaCy NER pipeline.
+
+    With AIAP_NER_GPU=1 the transformer model runs on the GPU; if CUDA or
+    the model is unavailable this falls back to the CPU model.
+    """
+    if os.environ.get("AIAP_NER_GPU") == "1":
+        try:
+            spacy.require_gpu()
+            return spacy.load("en_core_web_trf", exclude=UNUSED_PIPES)
+        except (ImportError, OSError, ValueError) as exc:
+            print(f"GPU NER unavailable ({exc}); using en_core_web_sm", file=sys.stderr)
+    return spacy.load("en_core_web_sm", exclude=UNUSED_PIPES)
+
+
+# Load spaCy model for Named Entity Recognition
+nlp = _load_ner_model()
+
+# Entity labels treated as PII (names and potential dates of birth)
+NER_PII_LABELS = ('PERSON', 'DATE')
+
+# Alternatives are tried left to right at each position, so longer
+# digit patterns come first (a card number also contains a phone number)
+_DIGIT_PII_RE = re.compile(
+    r'(?P<CREDIT_CARD>\b\d{4}[\s-]?\d{4}[\s-]?\d{4}[\s-]?\d{4}\b)|'
+    r'(?P<SSN>\b\d{3}[-\s]?\d{2}[-\s]?\d{4}\b)|'
+    r'(?P<PHONE>\b\d{3}[-.\s]?\d{3}[-.\s]?\d{4}\b)'
+)
+# Every regex PII type needs a digit or an '@'; one C-level scan for either
+# lets transcripts without them skip the pattern matching entirely
+_PII_TRIGGER_RE = re.compile(r'[\d@]')
+_EMAIL_RE = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b')
+
+
+def _next_email(text, pos):
+    """Return the first email match starting at or after ``pos``, or None.
+
+    The regex only runs around each '@': an email cannot contain
+    whitespace, so the token enclosing an '@' bounds every match that
+    uses it.
+    """
+    length = len(text)
+    at = text.find('@', pos)
+    while at != -1:
+        start = at
+        while start > pos and not text[start - 1].isspace():
+            start -= 1
+        end = at + 1
+        while end < length and not text[end].isspace():
+            end += 1
+        match = _EMAIL_RE.search(text, start, end)
+        if match:
+            return match
+        at = text.find('@', end)
+    return None
+
+
+def redact_pii_regex(text):
+    """Redact PII using regex patterns"""
+
+    if not _PII_TRIGGER_RE.search(text):
+        return text, []
+
+    redactions = []
+    parts = []
+    cursor = 0
+    digit = _DIGIT_PII_RE.search(text)
+    email = _next_email(text, 0)
+
+    while digit or email:
+        # Earliest match wins and digit patterns win ties, as they would
+        # as the leading alternatives of a single regex
+        if digit and (not email or digit.start() <= email.start()):
+            match, pii_type = digit, digit.lastgroup
+        else:
+            match, pii_type = email, 'EMAIL'
+        start, end = match.span()
+        parts.append(text[cursor:start])
+        parts.append(f'[REDACTED_{pii_type}]')
+        cursor = end
+        redactions.append({
+            'type': pii_type,
+            'original': match.group(),
+            'position': (start, end)
+        })
+        # Resume any search whose match was consumed by this one
+        if digit and digit.start() < cursor:
+            digit = _DIGIT_PII_RE.search(text, cursor)
+        if email and email.start() < cursor:
+            email = _next_email(text, cursor)
+    parts.append(text[cursor:])
+
+    return ''.join(parts), redactions
+
+
+def _redact_entities(doc):
+    """Replace PII entities of a processed ``doc`` with placeholders."""
+
+    text = doc.text
+    redactions = []
+    parts = []
+    cursor = 0
+
+    # doc.ents is ordered by position, so slices are appended front to back
+    for ent in doc.ents:
+        if ent.label_ not in NER_PII_LABELS:
+            continue
+        parts.append(text[cursor:ent.start_char])
+        parts.append(f'[REDACTED_{ent.label_}]')
+        cursor = ent.end_char
+        redactions.append({
+            'type': ent.label_,
+            'original': ent.text,
+            'position': (ent.start_char, ent.end_char)
+        })
+    parts.append(text[cursor:])
+
+    return ''.join(parts), redactions
+
+
+def redact_pii_ner(text):
+    """Redact PII using Named Entity Recognition"""
+
+    return _redact_entities(nlp(text))
+
+
+def redact_pii_ner_batch(texts):
+    """Redact PII in many transcripts, batching them through ``nlp.pipe``.
+
+    Batch size and worker count come from AIAP_SPACY_BATCH_SIZE (default
+    64) and AIAP_SPACY_N_PROCESS (default 1).  Returns one
+    ``(redacted, redactions)`` tuple per input text, in order.
+    """
+
+    batch_size = int(os.environ.get("AIAP_SPACY_BATCH_SIZE", "64"))
+    n_process = int(os.environ.get("AIAP_SPACY_N_PROCESS", "1"))
+    docs = nlp.pipe(texts, batch_size=batch_size, n_process=n_process)
+    return [_redact_entities(doc) for doc in docs]
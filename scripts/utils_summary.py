@@ -0,0 +1,86 @@
+"""Extractive summarization shared by the TTS scripts.
+
+Sentences are ranked with TextRank: TF-IDF vectors give a cosine
+similarity graph and PageRank over that graph scores each sentence.  The
+top sentences are kept in their original order.  Text-to-Speech is
+billed per character, so picking the most central sentences rather than
+the first few gets more content into the same audio budget.
+
+Sentence boundaries come from spaCy's rule-based sentencizer on a blank
+English pipeline, which handles decimals and abbreviations that a plain
+``'. '`` split breaks on, without loading any model weights.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+import spacy
+from scipy import sparse
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+PAGERANK_DAMPING = 0.85
+PAGERANK_TOLERANCE = 1e-6
+PAGERANK_MAX_ITER = 100
+
+_sentencizer = spacy.blank("en")
+_sentencizer.add_pipe("sentencizer")
+
+
+def _split_sentences(text: str) -> list[str]:
+    sentences = (sent.text.strip() for sent in _sentencizer(text).sents)
+    return [s for s in sentences if s]
+
+
+def _textrank_scores(sentences: list[str]) -> np.ndarray:
+    """Score sentences by PageRank over their TF-IDF cosine similarity.
+
+    Raises ValueError if no sentence contains a non-stop word.
+    """
+    n = len(sentences)
+    # TfidfVectorizer L2-normalises rows, so X @ X.T is the cosine similarity
+    tfidf = TfidfVectorizer(stop_words="english").fit_transform(sentences)
+    similarity = sparse.csr_matrix(tfidf @ tfidf.T)
+    similarity.setdiag(0)
+    similarity.eliminate_zeros()
+
+    out_weight = np.asarray(similarity.sum(axis=1)).ravel()
+    dangling = out_weight == 0
+    inv_weight = np.divide(1.0, out_weight, out=np.zeros(n), where=~dangling)
+    # Column-stochastic transition matrix for the power iteration
+    transition = (sparse.diags(inv_weight) @ similarity).T.tocsr()
+
+    scores = np.full(n, 1.0 / n)
+    for _ in range(PAGERANK_MAX_ITER):
+        # Sentences sharing no terms spread their rank uniformly
+        spread = scores[dangling].sum() / n
+        updated = (1 - PAGERANK_DAMPING) / n + PAGERANK_DAMPING * (transition @ scores + spread)
+        converged = np.abs(updated - scores).sum() < PAGERANK_TOLERANCE
+        scores = updated
+        if converged:
+            break
+    return scores
+
+
+def summarize_text(text, max_sentences=3):
+    """
+    Extractive TextRank summarization: keep the N highest-ranked
+    sentences in their original order.
+    """
+    sentences = _split_sentences(text)
+
+    if len(sentences) > max_sentences:
+        try:
+            scores = _textrank_scores(sentences)
+        except ValueError:
+            # Only stop words; nothing to rank on, so keep the opening
+            keep = range(max_sentences)
+        else:
+            keep = sorted(np.argsort(-scores, kind="stable")[:max_sentences])
+        sentences = [sentences[i] for i in keep]
+
+    summary = ' '.join(sentences)
+
+    if not summary.endswith(('.', '!', '?')):
+        summary += '.'
+
+    return summary
@@ -0,0 +1,77 @@
+import pytest
+
+speech = pytest.importorskip("google.cloud.speech")
+
+import _stt_cache  # noqa: E402
+
+
+def _result(transcript, words):
+    alternative = speech.SpeechRecognitionAlternative(
+        transcript=transcript,
+        words=[speech.WordInfo(word=w, confidence=c) for w, c in words],
+    )
+    return speech.SpeechRecognitionResult(alternatives=[alternative])
+
+
+def test_best_alternative_joins_all_segments():
+    response = speech.RecognizeResponse(results=[
+        _result("Hello there.", [("Hello", 0.9), ("there", 0.8)]),
+        speech.SpeechRecognitionResult(),
+        _result(" My card is 4111.", [("My", 0.5)]),
+    ])
+
+    alternative = _stt_cache.best_alternative(response)
+
+    assert alternative.transcript == "Hello there. My card is 4111."
+    assert [w.word for w in alternative.words] == ["Hello", "there", "My"]
+    assert _stt_cache.word_confidences(alternative.words).tolist() == pytest.approx([0.9, 0.8, 0.5])
+
+
+def test_best_alternative_of_empty_response():
+    alternative = _stt_cache.best_alternative(speech.RecognizeResponse())
+
+    assert alternative.transcript == ""
+    assert len(alternative.words) == 0
+
+
+def test_unknown_duration_is_estimated_from_size(monkeypatch):
+    monkeypatch.setattr(_stt_cache, "audio_duration", lambda path: None)
+    bytes_per_second = _stt_cache.ESTIMATE_BITS_PER_SECOND // 8
+
+    assert not _stt_cache._needs_long_running("short.mp3", b"\0" * bytes_per_second * 30)
+    assert _stt_cache._needs_long_running("long.mp3", b"\0" * bytes_per_second * 120)
+
+
+def test_cache_files_are_private(tmp_path, monkeypatch):
+    cache_dir = tmp_path / "cache"
+    monkeypatch.setattr(_stt_cache, "CACHE_DIR", str(cache_dir))
+    path = str(cache_dir / "entry.pb")
+
+    _stt_cache._write_cached(path, speech.RecognizeResponse())
+
+    assert (cache_dir.stat().st_mode & 0o777) == 0o700
+    assert (tmp_path / "cache" / "entry.pb").stat().st_mode & 0o777 == 0o600
+    assert _stt_cache._read_cached(path) == speech.RecognizeResponse()
+
+
+def test_mp3_requests_state_the_sample_rate(monkeypatch):
+    encoding = speech.RecognitionConfig.AudioEncoding
+    monkeypatch.setattr(_stt_cache, "audio_sample_rate", lambda path: 44100)
+
+    assert _stt_cache._request_sample_rate("talk.mp3", encoding.MP3) == 44100
+    assert _stt_cache._request_sample_rate("talk.wav", encoding.LINEAR16) is None
+    assert _stt_cache._config_for(encoding.MP3, 44100).sample_rate_hertz == 44100
+
+    monkeypatch.setattr(_stt_cache, "audio_sample_rate", lambda path: None)
+    assert _stt_cache._request_sample_rate("talk.mp3", encoding.MP3) == _stt_cache.DEFAULT_SAMPLE_RATE
+
+
+def test_memory_cache_is_bounded(tmp_path, monkeypatch):
+    monkeypatch.setattr(_stt_cache, "CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(_stt_cache, "_responses", _stt_cache.OrderedDict())
+    monkeypatch.setattr(_stt_cache, "_recognize", lambda *args: speech.RecognizeResponse())
+
+    for i in range(_stt_cache.MEMORY_CACHE_SIZE + 5):
+        _stt_cache.get_response("clip.wav", content=str(i).encode())
+
+    assert len(_stt_cache._responses) == _stt_cache.MEMORY_CACHE_SIZE
@@ -0,0 +1,28 @@
+from types import SimpleNamespace
+
+import pytest
+
+texttospeech = pytest.importorskip("google.cloud.texttospeech")
+
+import _tts  # noqa: E402
+
+
+class _FakeClient:
+    def __init__(self):
+        self.requests = []
+
+    def synthesize_speech(self, input, voice, audio_config):
+        self.requests.append((input.text, voice.name))
+        return SimpleNamespace(audio_content=b"ID3 fake mp3")
+
+
+def test_text_to_speech_writes_audio_with_one_client(tmp_path, monkeypatch):
+    client = _FakeClient()
+    monkeypatch.setattr(_tts, "_tts_client", lambda: client)
+    first, second = tmp_path / "a.mp3", tmp_path / "b.mp3"
+
+    assert _tts.text_to_speech("Hello.", str(first)) == str(first)
+    _tts.text_to_speech("Bye.", str(second), voice_name="en-US-Neural2-C")
+
+    assert first.read_bytes() == b"ID3 fake mp3"
+    assert client.requests == [("Hello.", _tts.DEFAULT_VOICE), ("Bye.", "en-US-Neural2-C")]
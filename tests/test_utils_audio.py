@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+sf = pytest.importorskip("soundfile")
+
+import utils_audio  # noqa: E402
+
+
+def _tone():
+    return 0.3 * np.sin(np.arange(16000) / 5) + 0.1
+
+
+def _expected_snr(y):
+    return 10 * np.log10(np.mean(y ** 2) / np.var(y))
+
+
+@pytest.mark.parametrize("fmt, subtype, ext", [
+    ("WAV", "PCM_16", "wav"),
+    ("WAV", "FLOAT", "wav"),
+    ("WAV", "DOUBLE", "wav"),
+    ("AIFF", "FLOAT", "aiff"),
+])
+def test_calculate_snr_matches_float_reference(tmp_path, fmt, subtype, ext):
+    y = _tone()
+    path = str(tmp_path / f"tone.{ext}")
+    sf.write(path, y, 16000, format=fmt, subtype=subtype)
+
+    assert utils_audio.calculate_snr(path) == pytest.approx(_expected_snr(y), abs=1e-2)
+    assert utils_audio.calculate_snr(utils_audio.read_audio_bytes(path)) == pytest.approx(
+        _expected_snr(y), abs=1e-2
+    )
+
+
+def test_calculate_snr_of_empty_file_is_inf(tmp_path):
+    path = str(tmp_path / "empty.wav")
+    sf.write(path, np.zeros(0), 16000, subtype="PCM_16")
+
+    assert utils_audio.calculate_snr(path) == float("inf")
+
+
+def test_stereo_downmix_rounds_to_nearest(tmp_path):
+    path = str(tmp_path / "stereo.wav")
+    left = np.array([1, -1, 3, -3, 32767], dtype=np.int16)
+    right = np.array([0, 0, 0, 0, 32767], dtype=np.int16)
+    sf.write(path, np.stack([left, right], axis=1), 16000, subtype="PCM_16")
+
+    y, sr = utils_audio.load_pcm16(path)
+
+    # Halves round to even, so the mean error is zero rather than -0.5
+    assert y.tolist() == [0, 0, 2, -2, 32767]
+    assert sr == 16000
@@ -0,0 +1,71 @@
+import importlib
+from unittest import mock
+
+import pytest
+
+spacy = pytest.importorskip("spacy")
+
+
+@pytest.fixture(scope="module")
+def utils_pii():
+    # Regex redaction does not need the NER model, so load a blank pipeline
+    with mock.patch.object(spacy, "load", return_value=spacy.blank("en")):
+        return importlib.import_module("utils_pii")
+
+
+def test_redacts_each_regex_type(utils_pii):
+    text = "Call 555-123-4567, SSN 123-45-6789, card 4111 1111 1111 1111, mail a.b@x.com"
+    redacted, redactions = utils_pii.redact_pii_regex(text)
+
+    assert redacted == (
+        "Call [REDACTED_PHONE], SSN [REDACTED_SSN], card [REDACTED_CREDIT_CARD], "
+        "mail [REDACTED_EMAIL]"
+    )
+    assert [r["type"] for r in redactions] == ["PHONE", "SSN", "CREDIT_CARD", "EMAIL"]
+
+
+@pytest.mark.parametrize("text, digit_type, email", [
+    ("Call 555-123-4567.jane@example.com today", "PHONE", ".jane@example.com"),
+    ("Card 1234 5678 9012 3456.bob@x.org", "CREDIT_CARD", ".bob@x.org"),
+])
+def test_email_after_digit_match_in_same_token(utils_pii, text, digit_type, email):
+    redacted, redactions = utils_pii.redact_pii_regex(text)
+
+    assert "@" not in redacted
+    assert [(r["type"], r["original"]) for r in redactions][-1] == ("EMAIL", email)
+    assert redactions[0]["type"] == digit_type
+
+
+def test_text_without_digits_or_at_is_unchanged(utils_pii):
+    assert utils_pii.redact_pii_regex("no pii here") == ("no pii here", [])
+
+
+@pytest.fixture
+def ner_nlp(utils_pii, monkeypatch):
+    # A rule-based stand-in for the statistical NER model
+    nlp = spacy.blank("en")
+    ruler = nlp.add_pipe("entity_ruler")
+    ruler.add_patterns([
+        {"label": "PERSON", "pattern": "Jane Doe"},
+        {"label": "DATE", "pattern": "March 3"},
+        {"label": "ORG", "pattern": "Acme"},
+    ])
+    monkeypatch.setattr(utils_pii, "nlp", nlp)
+    monkeypatch.setenv("AIAP_SPACY_BATCH_SIZE", "2")
+    return nlp
+
+
+def test_ner_batch_matches_single_text_redaction(utils_pii, ner_nlp):
+    texts = [
+        "Jane Doe called Acme on March 3.",
+        "nothing to redact",
+        "",
+        "Ask for Jane Doe.",
+        "Born March 3, like Jane Doe.",
+    ]
+
+    batch = utils_pii.redact_pii_ner_batch(texts)
+
+    assert batch == [utils_pii.redact_pii_ner(text) for text in texts]
+    assert batch[0][0] == "[REDACTED_PERSON] called Acme on [REDACTED_DATE]."
+    assert [redacted for redacted, _ in batch][1:4] == ["nothing to redact", "", "Ask for [REDACTED_PERSON]."]
@@ -0,0 +1,44 @@
+import pytest
+
+pytest.importorskip("spacy")
+pytest.importorskip("sklearn")
+
+import utils_summary  # noqa: E402
+
+
+def test_central_sentence_outranks_unrelated_one():
+    text = (
+        "The weather was sunny today. "
+        "The invoice payment failed twice. "
+        "Support retried the invoice payment. "
+        "The payment team fixed the invoice."
+    )
+
+    summary = utils_summary.summarize_text(text, max_sentences=2)
+
+    assert "weather" not in summary
+    assert "invoice" in summary
+
+
+def test_keeps_original_sentence_order():
+    text = (
+        "Refunds take five days. "
+        "Bananas are yellow. "
+        "Customers asked about refunds. "
+        "Refunds are issued to the original card."
+    )
+
+    summary = utils_summary.summarize_text(text, max_sentences=3)
+
+    positions = [text.index(s) for s in utils_summary._split_sentences(summary)]
+    assert positions == sorted(positions)
+
+
+def test_stop_word_only_input_keeps_leading_sentences():
+    text = "It is. We were. They are. She was."
+
+    assert utils_summary.summarize_text(text, max_sentences=2) == "It is. We were."
+
+
+def test_empty_input():
+    assert utils_summary.summarize_text("") == "."